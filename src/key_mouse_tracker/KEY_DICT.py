@@ -1,28 +1,73 @@
-from typing import Callable, Dict
+from typing import Callable, Dict, Optional, Tuple
 
 from pynput.keyboard import Key
 
-LEFT_ALPHANUM = ['`', '1', '2', '3', '4', '5', '6', '~', '!', '@', '#', '$', '%', '^',
-                 'q', 'w', 'e', 'r', 't',
-                 'a', 's', 'd', 'f', 'g',
-                 'z', 'x', 'c', 'v', 'b', ]
+LEFT_ALPHANUM = frozenset(['`', '1', '2', '3', '4', '5', '6', '~', '!', '@', '#', '$', '%', '^',
+                           'q', 'w', 'e', 'r', 't',
+                           'a', 's', 'd', 'f', 'g',
+                           'z', 'x', 'c', 'v', 'b', ])
 
-RIGHT_ALPHANUM = ['7', '8', '9', '0', '&', '*', '(', ')', '-', '=', '_', '+',
-                  'y', 'u', 'i', 'o', 'p', '[', ']', '{', '}', '|', '\\',
-                  'h', 'j', 'k', 'l', ';', ':', "'", '"',
-                  'n', 'm', ',', '.', '/', '<', '>', '?']
+RIGHT_ALPHANUM = frozenset(['7', '8', '9', '0', '&', '*', '(', ')', '-', '=', '_', '+',
+                            'y', 'u', 'i', 'o', 'p', '[', ']', '{', '}', '|', '\\',
+                            'h', 'j', 'k', 'l', ';', ':', "'", '"',
+                            'n', 'm', ',', '.', '/', '<', '>', '?'])
 
-# Key types of interest along with their differentiator function.
+# Alphanumeric character (in both cases) to key type, for classify().
+CHAR_TO_TYPE: Dict[str, str] = {}
+for _chars, _key_type in ((LEFT_ALPHANUM, 'left_alphanum'), (RIGHT_ALPHANUM, 'right_alphanum')):
+    for _char in _chars:
+        CHAR_TO_TYPE[_char] = _key_type
+        CHAR_TO_TYPE[_char.upper()] = _key_type
+
+# getattr() default telling keys without a char attribute from keys whose char is None
+_MISSING = object()
+
+
+def _builtin_key_type(key: Key) -> Optional[str]:
+    """
+    The built-in key type of a key, told apart with a single dictionary lookup. None for keys
+    that have none.
+    """
+    if key is Key.backspace:
+        return 'backspace'
+    if key is Key.delete:
+        return 'delete'
+    # a single getattr instead of hasattr and then key.char
+    char = getattr(key, 'char', _MISSING)
+    if char is _MISSING:
+        return 'special'
+    # None for 5 on the linux keypad (key.char = None) and for characters outside the
+    # alphanum lists
+    return CHAR_TO_TYPE.get(char)
+
+
+# Key types of interest along with their differentiator function. Add, replace or remove key
+# types here; the built-in functions are told apart by _builtin_key_type() all at once.
 KEY_DICT: Dict[str, Callable[[Key], bool]] = {
-    'left_alphanum': lambda key: (hasattr(key, 'char')
-                                  and key.char.lower() in LEFT_ALPHANUM),
-    'right_alphanum': lambda key: (hasattr(key, 'char')
-                                   and key.char.lower() in RIGHT_ALPHANUM),
-    # problem with 5 on the linux keypad: key.char = None and gives error with key.char.lower().
-    # ignore since it's rare. will add nothing to the log.
-    'backspace': lambda key: key == Key.backspace,
-    'delete': lambda key: key == Key.delete,
-    'special': lambda key: (not hasattr(key, 'char')
-                            and key != Key.backspace
-                            and key != Key.delete)
+    'left_alphanum': lambda key: _builtin_key_type(key) == 'left_alphanum',
+    'right_alphanum': lambda key: _builtin_key_type(key) == 'right_alphanum',
+    'backspace': lambda key: key is Key.backspace,
+    'delete': lambda key: key is Key.delete,
+    'special': lambda key: _builtin_key_type(key) == 'special',
 }
+
+# The built-in differentiator functions, answered by _builtin_key_type() as long as they are
+# the ones in KEY_DICT
+_BUILTIN_KEY_FUNCS = dict(KEY_DICT)
+
+
+def classify(key: Key) -> Tuple[str, ...]:
+    """
+    Return the KEY_DICT key types whose differentiator function matches a key, in the order of
+    KEY_DICT. The built-in functions are answered by a single _builtin_key_type() lookup instead
+    of being evaluated one by one. Returns () for keys that match no key type, which are not logged.
+
+    Parameters
+    ----------
+    key : pynput.keyboard.Key
+        The key pressed or released
+    """
+    builtin_key_type = _builtin_key_type(key)
+    return tuple(key_type for key_type, is_key_type in KEY_DICT.items()
+                 if (key_type == builtin_key_type if is_key_type is _BUILTIN_KEY_FUNCS.get(key_type)
+                     else is_key_type(key)))
@@ -1,11 +1,12 @@
+import functools
 import logging
 import os
+import queue
 import subprocess
 import threading
 import time
-from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, Optional, Tuple
 
 from pynput import keyboard, mouse
 from pynput.keyboard import Key
@@ -14,8 +15,112 @@ from . import KEY_DICT, config
 
 logger = logging.getLogger(__name__)
 
+# Bytes of log lines buffered in memory before they are written to the log file in one os.write().
+LOG_BUFFER_SIZE = 64 * 1024
+# Maximum time in seconds a log line stays in memory before it is written to the log file.
+LOG_FLUSH_INTERVAL = 0.5
+# Flags of the log and meta files: append only, so that a session starting within the same
+# second as the last one adds to its log file instead of truncating it, binary on Windows
+_LOG_FILE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0)
 
-class TrackerBase(ABC):
+# Log lines, formatted straight to bytes with the constant NaN fields formatted in once.
+# Timestamps and durations are logged in seconds with microsecond precision, and
+# coordinates with %r, which matches str() for ints and floats.
+_KEY_LINE = b'%s,%.6f,%.6f\n'
+_MOVE_LINE = b'move,%.6f,%r,%r,NaN,NaN,NaN,NaN\n'
+_CLICK_LINE = b'click,%.6f,%r,%r,%s,%r,NaN,NaN\n'
+_SCROLL_LINE = b'scroll,%.6f,%r,%r,NaN,NaN,%r,%r\n'
+
+# Requests to the writer thread, queued along with the log lines.
+_RENEW_SESSION = object()
+_STOP = object()
+
+
+def _key_id(key: Key) -> Hashable:
+    """
+    Identify a key by its virtual key code, an int that hashes and compares much faster than
+    the pynput key itself (KeyCode hashes its repr). Assumes that pynput reports a given
+    physical key with the same virtual key code on press and release. Keys without a virtual
+    key code are identified by the key itself.
+    """
+    if isinstance(key, Key):
+        key = key.value
+    vk = getattr(key, 'vk', None)
+    return key if vk is None else vk
+
+
+def _key_label(key_type: str, key: Key) -> bytes:
+    """
+    The key_type,key_name columns of the log lines of a key, with the name of alphanumeric keys
+    masked as NaN.
+    """
+    key_name = 'NaN' if hasattr(key, 'char') else str(key)
+    return f'{key_type},{key_name}'.encode()
+
+
+def _key_types_and_labels(key: Key) -> Tuple[Tuple[str, bytes], ...]:
+    """
+    Each KEY_DICT key type of a key along with its _key_label(), () for keys that are not logged.
+    """
+    return tuple((key_type, _key_label(key_type, key)) for key_type in KEY_DICT.classify(key))
+
+
+# Key types and _key_label() of the special keys, which are enumerated by pynput and do not
+# depend on the keyboard layout, computed once at import
+_SPECIAL_KEY_LABELS = {key: _key_types_and_labels(key) for key in Key}
+
+
+def _classify_key(key: Key) -> Tuple[Tuple[str, bytes], ...]:
+    """
+    _key_types_and_labels() of a key, looked up for the special keys.
+    """
+    if isinstance(key, Key):
+        return _SPECIAL_KEY_LABELS[key]
+    return _key_types_and_labels(key)
+
+
+def _read_git_head(path: str) -> Optional[str]:
+    """
+    The commit hash of HEAD in the .git directory above path, read from the files of the directory.
+    None if it cannot be read that way, e.g. in a worktree or a submodule, where .git is a file,
+    or with a packed ref.
+    """
+    # stop at the first .git entry, as git does, so that an enclosing repository is not read
+    while not os.path.lexists(os.path.join(path, '.git')):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    git_dir = os.path.join(path, '.git')
+    if not os.path.isdir(git_dir):
+        return None
+    try:
+        with open(os.path.join(git_dir, 'HEAD')) as head_file:
+            head = head_file.read().strip()
+        if head.startswith('ref: '):
+            with open(os.path.join(git_dir, head[len('ref: '):])) as ref_file:
+                head = ref_file.read().strip()
+    except OSError:
+        return None
+    return head
+
+
+@functools.lru_cache(maxsize=None)
+def _git_revision_short_hash() -> str:
+    """
+    The short git hash of the repository, resolved once per process and shared by all trackers.
+    Read from .git directly when possible, to spare a git subprocess. The hash read that way is
+    always abbreviated to 7 characters, git's default, regardless of core.abbrev and of whether it
+    is ambiguous in the repository, unlike the output of git rev-parse --short.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    head = _read_git_head(package_dir)
+    if head is not None:
+        return head[:7]
+    return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=package_dir).decode('ascii').strip()
+
+
+class TrackerBase:
     """
     A base class for key tracker and mouse tracker. Not to be used alone. The tracker outputs
     the log and meta info of tracking sessions in a directory named 'outputs'. The logs are stored
@@ -33,22 +138,49 @@ class TrackerBase(ABC):
         The date at which the current session starts, e.g. 20220630
     _start_datetime : str
         The date and time at which the current session starts
+    _session_dir : str
+        The local directory of the date at which the current session starts
     _end_datetime : str
         The date and time at which the current session ends
     stopped : bool
         Whether the tracker has been stopped
+    _stopped_event : threading.Event
+        Set once the tracker has been stopped, to wait for it without polling stopped
+    _debug : bool
+        Whether debug messages are logged, checked once on start() so that the event callbacks
+        skip their debug messages at once when they are not
     local_save_dir: str
         specified in config.py
     remote_save_dir: str
         specified in config.py
+    _local_dev_dir : str
+        The local directory of the device, under local_save_dir
+    _remote_dev_dir : str
+        The remote directory of the device, under remote_save_dir
     git_hash: str
         git hash of the repository
-    _log_file : TextIOWrapper
-        The file of designated log output, opened with overwrite permission
-    _meta_file : TextIOWrapper
-        The file of designated meta info output, opened with overwrite permission
-    _lock : threading.Lock
-        The lock which prevents press and release actions from interleaving
+    _log_fd : int
+        The file descriptor of designated log output, opened in append mode
+    _meta_fd : int
+        The file descriptor of designated meta info output, opened in append mode and kept open
+        across the sessions of the same date
+    _meta_file_path : str
+        The path of the meta info file _meta_fd is open on
+    _log_buf : bytearray
+        Log lines not yet written to the log file, up to LOG_BUFFER_SIZE bytes, reused across
+        writes
+    _write_q : queue.SimpleQueue
+        Log lines from the event callbacks, as (template, values) to be formatted, and the
+        session renewal and stop requests, consumed in order by the writer thread
+    _write_log : callable
+        _write_q.put, bound once. Called by the event callbacks with (template, values) to queue
+        a line for the log file, formatted as template % values on the writer thread
+    _uploader : ThreadPoolExecutor
+        Single worker uploading the ended sessions in order, so that the writer thread keeps
+        writing the new session meanwhile
+    _writer : threading.Thread
+        The writer thread, the only one touching the session files while tracking, so that
+        the event callbacks do no I/O and need no lock
     listener:
         listener for mouse or keyboard
 
@@ -58,78 +190,170 @@ class TrackerBase(ABC):
         Starts the tracker
     stop()
         Stops the tracker
+    wait_for_stop(timeout)
+        Blocks until the tracker is stopped or the timeout expires
     renew_session()
         End current session and start a new one. To be used as a cron job.
     """
 
+    __slots__ = ('dev', 'listener', 'stopped', '_stopped_event', '_debug', 'git_hash', 'local_save_dir',
+                 'remote_save_dir', '_local_dev_dir', '_remote_dev_dir', '_start_time', '_end_time', '_start_date',
+                 '_start_datetime', '_end_datetime', '_session_dir', '_log_fd', '_meta_fd', '_meta_file_path',
+                 '_log_buf', '_write_q', '_write_log', '_writer', '_uploader')
+
     def __init__(self, dev=None, listener=None):
-        # create output directory
         self.dev = dev
         self.listener = listener
         self.stopped = None
-        self.git_hash = None
-        self._lock = threading.Lock()
-        self._meta_file = None
-        self._log_file = None
+        self._stopped_event = threading.Event()
+        self._debug = False
+        self._write_q = queue.SimpleQueue()
+        self._write_log = self._write_q.put
+        self._writer = None
+        self._uploader = None
+        self._meta_fd = None
+        self._meta_file_path = None
+        self._log_fd = None
+        self._log_buf = bytearray()
 
         if config.LOCAL_SAVE_DIR is None or config.REMOTE_SAVE_DIR is None:
             raise ValueError('The save and remote directories have not been specified in config.py')
         else:
             self.local_save_dir = config.LOCAL_SAVE_DIR
             self.remote_save_dir = config.REMOTE_SAVE_DIR
+        self._local_dev_dir = os.path.join(self.local_save_dir, self.dev)
+        self._remote_dev_dir = os.path.join(self.remote_save_dir, self.dev)
+        self.get_git_revision_short_hash()
 
     def _start_session(self):
         """
-        Start a new session for logging: create new log file, write the column names
+        Start a new session for logging: create new log file, write the column names. A session
+        starting within the same second as the last one appends to its log file
         """
 
         self._start_time = time.time()
-        self._start_datetime = datetime.fromtimestamp(self._start_time).strftime('%Y-%m-%d_%H-%M-%S')
-        self._start_date = self._start_datetime.split('_')[0].replace("-", "")
-        if not os.path.exists(os.path.join(self.local_save_dir, self.dev, self._start_date)):
-            os.mkdir(os.path.join(self.local_save_dir, self.dev, self._start_date))
-            os.mkdir(os.path.join(self.local_save_dir, self.dev, self._start_date, 'meta'))
-            os.mkdir(os.path.join(self.local_save_dir, self.dev, self._start_date, 'log'))
-        log_file_path = os.path.join(self.local_save_dir, self.dev, self._start_date, 'log', f'{self.dev}_log_{self._start_datetime}.csv')
-        self._log_file = open(log_file_path, 'w+')
-        self._init_log_file()
+        start_localtime = time.localtime(self._start_time)
+        self._start_datetime = time.strftime('%Y-%m-%d_%H-%M-%S', start_localtime)
+        self._start_date = time.strftime('%Y%m%d', start_localtime)
+        self._session_dir = os.path.join(self._local_dev_dir, self._start_date)
+        os.makedirs(os.path.join(self._session_dir, 'meta'), exist_ok=True)
+        os.makedirs(os.path.join(self._session_dir, 'log'), exist_ok=True)
+        log_file_path = os.path.join(self._session_dir, 'log', f'{self.dev}_log_{self._start_datetime}.csv')
+        self._log_fd = os.open(log_file_path, _LOG_FILE_FLAGS, 0o644)
+        if os.fstat(self._log_fd).st_size == 0:
+            self._init_log_file()
+
+    def _write_loop(self):
+        """
+        Writer thread: format the queued lines into the log buffer, write it to the log file
+        every LOG_BUFFER_SIZE bytes or LOG_FLUSH_INTERVAL seconds after its first pending line,
+        whichever comes first, and serve the session renewal and stop requests.
+        """
+
+        # time.monotonic() by which the pending lines are to be written, None if none is pending
+        flush_deadline = None
+        while True:
+            if flush_deadline is None:
+                line = self._write_q.get()
+            else:
+                try:
+                    line = self._write_q.get(timeout=max(flush_deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    line = None
+                if line is None:
+                    self._flush_log()
+                    flush_deadline = None
+                    continue
+            if line is _RENEW_SESSION:
+                session_dir, start_date = self._session_dir, self._start_date
+                # the writer keeps serving the queue when the files cannot be written
+                try:
+                    self._end_session()
+                except OSError:
+                    logger.exception('Exception on ending session:')
+                try:
+                    self._start_session()
+                except OSError:
+                    logger.exception('Exception on starting session, lines are dropped until the next one:')
+                flush_deadline = None
+                # upload when renewing or stopping. the new session keeps being written meanwhile
+                self._uploader.submit(self.upload, session_dir, start_date)
+            elif line is _STOP:
+                self._flush_log()
+                return
+            else:
+                template, values = line
+                try:
+                    self._log_buf += template % values
+                except Exception:
+                    logger.exception('Exception on formatting log line:')
+                if flush_deadline is None:
+                    flush_deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+                elif len(self._log_buf) >= LOG_BUFFER_SIZE or time.monotonic() >= flush_deadline:
+                    self._flush_log()
+                    flush_deadline = None
+
+    def _flush_log(self):
+        # os.write() may write only part of the buffer
+        try:
+            while self._log_buf and self._log_fd is not None:
+                del self._log_buf[:os.write(self._log_fd, self._log_buf)]
+        except OSError:
+            logger.exception('Exception on writing log file:')
+        # lines which could not be written are dropped rather than piling up, the log file is
+        # not open if the session could not be started
+        self._log_buf.clear()
 
     def _end_session(self):
         """
         write meta info and close the log files.
         """
 
-        self._log_file.close()
+        self._flush_log()
+        if self._log_fd is not None:
+            log_fd, self._log_fd = self._log_fd, None
+            os.close(log_fd)
         self._end_time = time.time()
-        self._end_datetime = datetime.fromtimestamp(self._end_time).strftime('%Y-%m-%d_%H-%M-%S')
-        meta_file_path = os.path.join(self.local_save_dir, self.dev, self._start_date, 'meta',
-                                      f'{self.dev}_meta_{self._start_date}.csv')
-        if self.git_hash is None:
-            self.get_git_revision_short_hash()
-        with open(meta_file_path, 'a') as self._meta_file:
-            if self._meta_file.tell() == 0:
-                self._meta_file.write('start_time,end_time,duration,git_hash\n')
-            self._meta_file.write(
-            f'{self._start_datetime},{self._end_datetime},{self._end_time - self._start_time},{self.git_hash}\n')
+        self._end_datetime = time.strftime('%Y-%m-%d_%H-%M-%S', time.localtime(self._end_time))
+        meta_file_path = os.path.join(self._session_dir, 'meta', f'{self.dev}_meta_{self._start_date}.csv')
+        meta_row = f'{self._start_datetime},{self._end_datetime},{self._end_time - self._start_time},{self.git_hash}\n'
+        if meta_file_path != self._meta_file_path:
+            # first session of the date since the tracker started
+            self._close_meta_file()
+            self._meta_fd = os.open(meta_file_path, _LOG_FILE_FLAGS, 0o644)
+            self._meta_file_path = meta_file_path
+            if os.fstat(self._meta_fd).st_size == 0:
+                meta_row = 'start_time,end_time,duration,git_hash\n' + meta_row
+        os.write(self._meta_fd, meta_row.encode())
+
+    def _close_meta_file(self):
+        if self._meta_fd is not None:
+            os.close(self._meta_fd)
+            self._meta_fd = self._meta_file_path = None
 
     def get_git_revision_short_hash(self) -> str:
-        self.git_hash = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
-                                           cwd=os.path.dirname(os.path.abspath(__file__))).decode('ascii').strip()
+        self.git_hash = _git_revision_short_hash()
         return self.git_hash
 
-    def upload(self):
+    def upload(self, session_dir: str, start_date: str):
+        """
+        Upload the local directory of a session date to the remote save directory.
+        """
+
         print(f'{self.dev}: upload log files...')
-        source_dir = os.path.join(self.local_save_dir, self.dev, self._start_date)
-        target_dir = os.path.join(self.remote_save_dir, self.dev, self._start_date)
-        subprocess.run(['rclone', 'copy', source_dir, target_dir])
+        target_dir = os.path.join(self._remote_dev_dir, start_date)
+        try:
+            subprocess.run(['rclone', 'copy', session_dir, target_dir])
+        except Exception:
+            logger.exception('Exception on upload:')
+            return
         print(f'{self.dev}: upload complete!')
 
-    @abstractmethod
     def _init_log_file(self):
         """
         To be overwritten
         """
-        pass
+        raise NotImplementedError
 
     def start(self):
         """
@@ -137,43 +361,52 @@ class TrackerBase(ABC):
         """
 
         self.stopped = False
-        if not os.path.exists(os.path.join(self.local_save_dir, self.dev)):
-            os.makedirs(os.path.join(self.local_save_dir, self.dev), exist_ok=False)
+        self._stopped_event.clear()
+        self._debug = logger.isEnabledFor(logging.DEBUG)
         self._start_session()
+        self._uploader = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'{self.dev}_uploader')
+        self._writer = threading.Thread(target=self._write_loop, name=f'{self.dev}_writer', daemon=True)
+        self._writer.start()
         self.listener.start()
         self.listener.join()
 
     def stop(self):
         """
-        Stops tracking: close the meta info file and stop the listener.
+        Stops tracking: stop the listener and close the meta info file.
         upload the local outputs and metadata log to the cloud.
         """
-        self._end_session()
-        self._meta_file.close()
+        # wait for the last event callback and the writer thread to finish before closing the session
         self.listener.stop()
+        self.listener.join()
+        self._write_q.put(_STOP)
+        self._writer.join()
+        self._end_session()
+        self._close_meta_file()
         self.stopped = True
-        # upload when renewing or stopping
-        self.upload()
+        self._stopped_event.set()
+        # upload when renewing or stopping, after the uploads of the previous sessions
+        self._uploader.submit(self.upload, self._session_dir, self._start_date)
+        self._uploader.shutdown(wait=True)
+
+    def wait_for_stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the tracker is stopped or the timeout in seconds expires.
+        Returns whether the tracker has been stopped.
+        """
+
+        return self._stopped_event.wait(timeout)
 
     def renew_session(self):
         """
         End current session and start a new one. To be used as a cron job.
+        The writer thread renews the session once it has written the lines queued so far.
         """
 
         print('\n###################')
         print(f'NEW {self.dev.upper()} LOGGER SESSION ENTERED')
         print('###################\n')
 
-        self._lock.acquire()  # to avoid collision with a key press or release
-
-        try:
-            self._end_session()
-            self._start_session()
-
-        finally:
-            self._lock.release()
-        # upload when renewing or stopping
-        self.upload()
+        self._write_q.put(_RENEW_SESSION)
 
 
 class KeyTrackerPrivate(TrackerBase):
@@ -185,30 +418,35 @@ class KeyTrackerPrivate(TrackerBase):
     Attributes
     ----------
     dev : string
-        'mouse'
+        'key'
     listener:
-        a listener based on pynput.mouse.Listener
+        a listener based on pynput.keyboard.Listener
     _is_last_action_release : bool
         Whether the last action is release or not
-    _last_pressed_key : pynput.keyboard.Key
-        The last key pressed
-    _first_pressed_time : float
-        The timestamp at which the last key was pressed at any given time
-        during session
+    _last_pressed_key : Hashable
+        The _key_id() of the last key pressed
+    _first_pressed_time : dict
+        The time.monotonic_ns() at which the last key was pressed at any given time
+        during session, by _key_id()
+    _pressed_key_labels : dict
+        The (key type, _key_label()) pairs of each key currently pressed, computed on its first
+        press, by _key_id(). () for keys that are not logged
     """
 
+    __slots__ = ('_last_pressed_key', '_first_pressed_time', '_pressed_key_labels', '_is_last_action_release')
+
     def __init__(self):
         _listener = keyboard.Listener(
             on_press=self._on_press,
             on_release=self._on_release)
-        # create output directory
         super(KeyTrackerPrivate, self).__init__(dev='key', listener=_listener)
         self._last_pressed_key = None
-        self._first_pressed_time: Dict[Key, float] = {}
+        self._first_pressed_time: Dict[Hashable, int] = {}
+        self._pressed_key_labels: Dict[Hashable, Tuple[Tuple[str, bytes], ...]] = {}
         self._is_last_action_release = True
 
     def _init_log_file(self):
-        self._log_file.write('key_type,key_name,timestamp,duration\n')
+        self._log_buf += b'key_type,key_name,timestamp,duration\n'
 
     def _on_press(self, key: Key):
         """
@@ -221,30 +459,25 @@ class KeyTrackerPrivate(TrackerBase):
         key : pynput.keyboard.Key
             The key pressed
         """
-        self._lock.acquire()  # guarantee ongoing actions complete
-        now = time.time()
         try:
+            key_id = _key_id(key)
             # Only update _first_pressed_time[key] if following a release action
             # or if the last key pressed is not the current key pressed. In other
             # words, in the event where the current key was pressed last and not
             # released, do not update its first pressed time value and instead
             # count it as a continued key press.
-            if self._is_last_action_release or self._last_pressed_key != key:
-                self._first_pressed_time[key] = now
-            self._last_pressed_key = key
+            if self._is_last_action_release or self._last_pressed_key != key_id:
+                self._first_pressed_time[key_id] = time.monotonic_ns()
+                self._pressed_key_labels[key_id] = _classify_key(key)
+            self._last_pressed_key = key_id
             self._is_last_action_release = False
-            for key_type, is_key_type in KEY_DICT.KEY_DICT.items():
-                if is_key_type(key):
-                    try:
-                        # print for debugging purpose, not logged
-                        logging.debug(f'{key_type} key: {key.char} pressed , time: {now}')
-                    except AttributeError:
-                        logging.debug(f'{key_type} key: {key} pressed, time: {now}')
+            if self._debug:
+                now = time.time()
+                for key_type, _ in self._pressed_key_labels[key_id]:
+                    # for debugging purpose, not logged
+                    logger.debug('%s key: %s pressed, time: %s', key_type, getattr(key, 'char', key), now)
         except Exception:
-            logging.exception('Exception on press:', exc_info=True)
-
-        finally:
-            self._lock.release()
+            logger.exception('Exception on press:')
 
     def _on_release(self, key: Key):
         """
@@ -256,33 +489,30 @@ class KeyTrackerPrivate(TrackerBase):
             The key released
         """
 
-        self._lock.acquire()  # guarantee ongoing actions complete
         now = time.time()
         try:
             # problem with some key combinations: i.e. press shift + c and then release shift first. Will record 'C' press
-            # and 'c' release. Might cause key error exception if 'c' has not been added to the '_first_pressed_time'
-            # dictionary. ignore errors like this since it's rare. the key causing error will not be logged.
-
-            key_press_span = now - self._first_pressed_time[key]
+            # and 'c' release, while 'c' might not have been added to the '_first_pressed_time' dictionary. ignore
+            # releases like this since it's rare. the key will not be logged.
+
+            key_id = _key_id(key)
+            # remove key from dictionaries once released. only keys currently pressed will stay
+            first_pressed_time = self._first_pressed_time.pop(key_id, None)
+            if first_pressed_time is None:
+                if self._debug:
+                    logger.debug('key: %s released without being pressed, not logged', getattr(key, 'char', key))
+                return
+            # monotonic clock, so that the duration is not skewed by system clock adjustments
+            key_press_span = (time.monotonic_ns() - first_pressed_time) / 1e9
             self._is_last_action_release = True
-            # remove key from dictionary once released. only keys currently pressed will stay
-            self._first_pressed_time.pop(key)
-            for key_type, is_key_type in KEY_DICT.KEY_DICT.items():
-                if is_key_type(key):
-                    try:
-                        logging.debug(f'{key_type} key: {key.char} released, time: {now}, duration: {key_press_span}')
-                        self._log_file.write(
-                            f'{key_type},NaN,{now},{key_press_span}\n')
-                    except AttributeError:
-                        logging.debug(f'{key_type} key: {key} released, time: {now}, duration: {key_press_span}')
-                        self._log_file.write(
-                            f'{key_type},{key},{now},{key_press_span}\n')
+            for key_type, key_label in self._pressed_key_labels.pop(key_id):
+                if self._debug:
+                    logger.debug('%s key: %s released, time: %s, duration: %s',
+                                 key_type, getattr(key, 'char', key), now, key_press_span)
+                self._write_log((_KEY_LINE, (key_label, now, key_press_span)))
 
         except Exception:
-            logging.exception(f'Exception on release:', exc_info=True)
-
-        finally:
-            self._lock.release()
+            logger.exception('Exception on release:')
 
 
 class MouseTracker(TrackerBase):
@@ -295,48 +525,62 @@ class MouseTracker(TrackerBase):
         'mouse'
     listener:
         a listener based on pynput.mouse.Listener
+    _move_interval : float
+        config.MOUSE_MOVE_MIN_INTERVAL, the minimum interval in seconds between two logged moves
+    _move_distance : float
+        config.MOUSE_MOVE_MIN_DISTANCE, the minimum distance in pixels between two logged moves
+    _last_move_time : float
+        timestamp of the last logged move
+    _last_move_x, _last_move_y : float
+        coordinate of the last logged move
     """
 
+    __slots__ = ('_move_interval', '_move_distance', '_last_move_time', '_last_move_x', '_last_move_y')
+
     def __init__(self):
         _listener = mouse.Listener(
             on_move=self._on_move,
             on_click=self._on_click,
             on_scroll=self._on_scroll)
         super(MouseTracker, self).__init__(dev='mouse', listener=_listener)
-        self.dev = 'mouse'
+        self._move_interval = config.MOUSE_MOVE_MIN_INTERVAL
+        self._move_distance = config.MOUSE_MOVE_MIN_DISTANCE
+        self._last_move_time = 0.0
+        # no move logged yet, so that the first move is always logged
+        self._last_move_x = self._last_move_y = float('inf')
 
     def _init_log_file(self):
-        self._log_file.write('mouse_type,timestamp,x,y,button,press,dx,dy\n')
+        self._log_buf += b'mouse_type,timestamp,x,y,button,press,dx,dy\n'
 
     def _on_move(self, x, y):
         now = time.time()
-        self._lock.acquire()  # guarantee ongoing actions complete
+        if self._move_interval and 0 <= now - self._last_move_time < self._move_interval:
+            return
+        if self._move_distance and abs(x - self._last_move_x) + abs(y - self._last_move_y) < self._move_distance:
+            return
+        self._last_move_time = now
+        self._last_move_x, self._last_move_y = x, y
         try:
-            logging.debug(f'move, time: {now}, coordinate: ({x}, {y})')
-            self._log_file.write(f'move,{now},{x},{y},NaN,NaN,NaN,NaN\n')
+            if self._debug:
+                logger.debug('move, time: %s, coordinate: (%s, %s)', now, x, y)
+            self._write_log((_MOVE_LINE, (now, x, y)))
         except Exception:
-            logging.exception('Exception on move:', exc_info=True)
-        finally:
-            self._lock.release()
+            logger.exception('Exception on move:')
 
     def _on_click(self, x, y, button, pressed):
         now = time.time()
-        self._lock.acquire()  # guarantee ongoing actions complete
         try:
-            logging.debug(f'click, time: {now}, coordinate: ({x}, {y}), button: {button}, press: {pressed}')
-            self._log_file.write(f'click,{now},{x},{y},{button},{pressed},NaN,NaN\n')
+            if self._debug:
+                logger.debug('click, time: %s, coordinate: (%s, %s), button: %s, press: %s', now, x, y, button, pressed)
+            self._write_log((_CLICK_LINE, (now, x, y, str(button).encode(), pressed)))
         except Exception:
-            logging.exception('Exception on click:', exc_info=True)
-        finally:
-            self._lock.release()
+            logger.exception('Exception on click:')
 
     def _on_scroll(self, x, y, dx, dy):
         now = time.time()
-        self._lock.acquire()  # guarantee ongoing actions complete
         try:
-            logging.debug(f'scroll, time: {now}, coordinate: ({x}, {y}), direction: ({dx},{dy})')
-            self._log_file.write(f'scroll,{now},{x},{y},NaN,NaN,{dx},{dy}\n')
+            if self._debug:
+                logger.debug('scroll, time: %s, coordinate: (%s, %s), direction: (%s,%s)', now, x, y, dx, dy)
+            self._write_log((_SCROLL_LINE, (now, x, y, dx, dy)))
         except Exception:
-            logging.exception('Exception on scroll:', exc_info=True)
-        finally:
-            self._lock.release()
+            logger.exception('Exception on scroll:')
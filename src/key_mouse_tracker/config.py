@@ -1,3 +1,10 @@
 # Directory to save the outputs
 LOCAL_SAVE_DIR = None
 REMOTE_SAVE_DIR = 'patient_wasabi:/weill-video/RCS07_video/patient_personal_computer/'
+# Minimum interval in seconds between two logged mouse moves. Moves within this interval of
+# the last logged move are dropped. 0 logs every move reported by the OS.
+MOUSE_MOVE_MIN_INTERVAL = 0
+# Minimum distance in pixels, as |dx| + |dy|, between two logged mouse moves. Moves closer than
+# this to the last logged move are dropped, i.e. 1 drops the moves that stay on the same pixel.
+# 0 logs every move reported by the OS.
+MOUSE_MOVE_MIN_DISTANCE = 0
@@ -1,8 +1,10 @@
 import argparse
 import logging
+import signal
 import sys
 import threading
 import time
+from typing import List
 
 from .Trackers import KeyTrackerPrivate, TrackerBase, MouseTracker
 
@@ -13,23 +15,28 @@ def run_tracker(tracker: TrackerBase):
     tracker.start()
 
 
-def run_renew_session(tracker: TrackerBase, session_length_in_hours):
+def run_renew_session(trackers: List[TrackerBase], session_length_in_hours):
     """
-    Start cron job for renewing sessions.
+    Start cron job for renewing the sessions of all the trackers, which share the same session length.
     """
-    # Using second as unit for counter here because we want to check frequently
-    # whether the main thread for tracking has exited.
-    counter_seconds = session_length_in_hours * SECONDS_IN_HOUR
-    logging.debug(f'{tracker.dev}: start renewing session')
-    while not tracker.stopped:
-        time.sleep(1)
-        counter_seconds -= 1
-
-        if counter_seconds <= 0:
-            # start new session and reset counter
+    # sleep for a whole session at once, waking up early only when a tracker is stopped.
+    # renew on a fixed monotonic schedule, so that late wake-ups do not add up over sessions
+    session_length = session_length_in_hours * SECONDS_IN_HOUR
+    deadline = time.monotonic() + session_length
+    logging.debug('start renewing sessions')
+    while True:
+        running_trackers = [tracker for tracker in trackers if not tracker.stopped]
+        if not running_trackers:
+            break
+        if running_trackers[0].wait_for_stop(max(deadline - time.monotonic(), 0)):
+            continue
+        for tracker in running_trackers:
             tracker.renew_session()
-            counter_seconds = session_length_in_hours * SECONDS_IN_HOUR
-    logging.debug(f'{tracker.dev}: end renewing session')
+        # skip the deadlines missed when falling behind rather than renewing back to back
+        deadline += session_length
+        while deadline <= time.monotonic():
+            deadline += session_length
+    logging.debug('end renewing sessions')
 
 
 def main():
@@ -45,6 +52,8 @@ def main():
                         help='Device to track. Example -dev key, default=both')
     args = parser.parse_args()
     logging.basicConfig(level=args.loglevel.upper())
+    # stop on SIGTERM like on ctrl + c, so that the buffered logs are written out and uploaded
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
     # Number of hours for each session's length.
     # set to be 30 sec for debugging; change to 1 hr when tracking
     if args.loglevel.upper() == 'DEBUG':
@@ -56,35 +65,33 @@ def main():
     mouse_tracker = None
     if args.device in ['key', 'both']:
         key_tracker = KeyTrackerPrivate()
-        key_tracker_thread = threading.Thread(target=(lambda: run_tracker(key_tracker)), name='key_tracker')
-        key_session_thread = threading.Thread(target=(lambda: run_renew_session(key_tracker, SESSION_LENGTH_IN_HOURS)),
-                                              name='key_session')
+        key_tracker_thread = threading.Thread(target=run_tracker, args=(key_tracker,), name='key_tracker')
 
     if args.device in ['mouse', 'both']:
         mouse_tracker = MouseTracker()
-        mouse_tracker_thread = threading.Thread(target=(lambda: run_tracker(mouse_tracker)), name='mouse_tracker')
-        mouse_session_thread = threading.Thread(
-            target=(lambda: run_renew_session(mouse_tracker, SESSION_LENGTH_IN_HOURS)), name='mouse_session')
+        mouse_tracker_thread = threading.Thread(target=run_tracker, args=(mouse_tracker,), name='mouse_tracker')
+
+    # a single thread renews the sessions of both trackers
+    trackers = [tracker for tracker in (key_tracker, mouse_tracker) if tracker is not None]
+    session_thread = threading.Thread(target=run_renew_session, args=(trackers, SESSION_LENGTH_IN_HOURS),
+                                      name='session')
     try:
         if key_tracker is not None:
             key_tracker_thread.start()
-            key_session_thread.start()
         if mouse_tracker is not None:
             mouse_tracker_thread.start()
-            mouse_session_thread.start()
+        session_thread.start()
 
         print('\n###############')
         print('TRACKING STARTS')
         print('###############\n')
 
+        # wait for threads to finish
         if key_tracker is not None:
-            # wait for threads to finish
             key_tracker_thread.join()
-            key_session_thread.join()
         if mouse_tracker is not None:
-            # wait for threads to finish
             mouse_tracker_thread.join()
-            mouse_session_thread.join()
+        session_thread.join()
 
     except KeyboardInterrupt:
         print('exiting loggers...')
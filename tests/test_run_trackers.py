@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    import pynput  # noqa: F401
+except ImportError as e:
+    raise unittest.SkipTest(f'pynput cannot be imported: {e}')
+
+from key_mouse_tracker import run_trackers
+
+# session length in seconds, SECONDS_IN_HOUR being patched to 1
+SESSION_LENGTH = 0.1
+
+
+class _FakeTracker:
+    """
+    Records the time.monotonic() of its session renewals.
+    """
+
+    def __init__(self, renewal_duration=0.0):
+        self.stopped = False
+        self.renewals = []
+        self._renewal_duration = renewal_duration
+        self._stopped_event = threading.Event()
+
+    def renew_session(self):
+        self.renewals.append(time.monotonic())
+        time.sleep(self._renewal_duration)
+
+    def wait_for_stop(self, timeout=None):
+        return self._stopped_event.wait(timeout)
+
+    def stop(self):
+        self.stopped = True
+        self._stopped_event.set()
+
+
+class TestRunRenewSession(unittest.TestCase):
+
+    def start(self, *trackers):
+        self.trackers = trackers
+        patcher = mock.patch.object(run_trackers, 'SECONDS_IN_HOUR', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.start_time = time.monotonic()
+        self.session_thread = threading.Thread(target=run_trackers.run_renew_session,
+                                               args=(list(trackers), SESSION_LENGTH), daemon=True)
+        self.session_thread.start()
+        # let the session thread end when a test fails before stopping the trackers
+        self.addCleanup(self.stop_all)
+
+    def stop_all(self):
+        for tracker in self.trackers:
+            tracker.stop()
+        self.session_thread.join(5)
+
+    def wait_for_renewals(self, tracker, count):
+        deadline = time.monotonic() + 5
+        while len(tracker.renewals) < count:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def assert_on_schedule(self, renewals, first=1):
+        """
+        The renewals are not earlier than their deadlines, SESSION_LENGTH apart from the start.
+        """
+        for n, renewal in enumerate(renewals, first):
+            self.assertGreaterEqual(renewal, self.start_time + n * SESSION_LENGTH)
+
+    def test_renews_all_trackers(self):
+        key_tracker, mouse_tracker = _FakeTracker(), _FakeTracker()
+        self.start(key_tracker, mouse_tracker)
+        self.wait_for_renewals(mouse_tracker, 3)
+        self.assertGreaterEqual(len(key_tracker.renewals), 3)
+        self.assert_on_schedule(key_tracker.renewals)
+        self.assert_on_schedule(mouse_tracker.renewals)
+
+    def test_one_tracker_stopped(self):
+        key_tracker, mouse_tracker = _FakeTracker(), _FakeTracker()
+        self.start(key_tracker, mouse_tracker)
+        self.wait_for_renewals(key_tracker, 1)
+        key_tracker.stop()
+        key_renewals = len(key_tracker.renewals)
+        renewals = len(mouse_tracker.renewals)
+        self.wait_for_renewals(mouse_tracker, renewals + 2)
+        # the other tracker keeps the same schedule
+        self.assertEqual(len(key_tracker.renewals), key_renewals)
+        self.assert_on_schedule(mouse_tracker.renewals)
+        self.assertTrue(self.session_thread.is_alive())
+
+    def test_exits_when_all_stopped(self):
+        key_tracker, mouse_tracker = _FakeTracker(), _FakeTracker()
+        self.start(key_tracker, mouse_tracker)
+        self.wait_for_renewals(mouse_tracker, 1)
+        mouse_tracker.stop()
+        key_tracker.stop()
+        # without waiting for the next deadline
+        self.session_thread.join(SESSION_LENGTH / 2)
+        self.assertFalse(self.session_thread.is_alive())
+
+    def test_skips_missed_deadlines(self):
+        # the first renewal takes 2.5 sessions: the deadlines at 2 and 3 sessions are missed
+        tracker = _FakeTracker(renewal_duration=2.5 * SESSION_LENGTH)
+        self.start(tracker)
+        self.wait_for_renewals(tracker, 2)
+        tracker._renewal_duration = 0
+        # the next renewal is at 4 sessions rather than right after the slow one
+        self.assert_on_schedule(tracker.renewals[1:], first=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,326 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+try:
+    from pynput.keyboard import Key, KeyCode
+    from pynput.mouse import Button
+except ImportError as e:
+    raise unittest.SkipTest(f'pynput cannot be imported: {e}')
+
+from key_mouse_tracker import Trackers, config
+
+KEY_HEADER = 'key_type,key_name,timestamp,duration'
+MOUSE_HEADER = 'mouse_type,timestamp,x,y,button,press,dx,dy'
+META_HEADER = 'start_time,end_time,duration,git_hash'
+
+
+class _StubListener:
+    """
+    Stands in for the pynput listener: the test calls the callbacks of the tracker itself.
+    """
+
+    def __init__(self):
+        self.started = threading.Event()
+        self._stopped = threading.Event()
+
+    def start(self):
+        self.started.set()
+
+    def join(self, timeout=None):
+        self._stopped.wait(timeout)
+
+    def stop(self):
+        self._stopped.set()
+
+
+class _TrackerTestCase(unittest.TestCase):
+    """
+    Runs a tracker with a stub listener, a temporary save directory and a wall clock set by the
+    tests through self.now.
+    """
+
+    tracker_class = None
+
+    def setUp(self):
+        save_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(save_dir.cleanup)
+        self.save_dir = save_dir.name
+        for patcher in (mock.patch.object(config, 'LOCAL_SAVE_DIR', self.save_dir),
+                        mock.patch.object(Trackers.TrackerBase, 'upload'),
+                        # the tracker reads the wall clock through time.time(), set by the tests
+                        mock.patch('time.time', side_effect=lambda: self.now)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.now = 1656600000.0
+
+    def start_tracker(self):
+        self.tracker = self.tracker_class()
+        self.tracker.listener = _StubListener()
+        self.tracker_thread = threading.Thread(target=self.tracker.start, daemon=True)
+        self.tracker_thread.start()
+        self.addCleanup(self._end_tracker)
+        self.assertTrue(self.tracker.listener.started.wait(5))
+
+    def _end_tracker(self):
+        # let the tracker threads end when a test fails before stopping the tracker
+        if not self.tracker.stopped:
+            self.tracker.listener.stop()
+            self.tracker._write_q.put(Trackers._STOP)
+            self.tracker._uploader.shutdown(wait=False)
+        self.tracker_thread.join(5)
+
+    def stop(self):
+        self.tracker.stop()
+        self.tracker_thread.join(5)
+        self.assertFalse(self.tracker_thread.is_alive())
+
+    def renew_session(self):
+        # the writer thread renews the session and then submits the upload of the last one
+        uploads = Trackers.TrackerBase.upload.call_count
+        self.tracker.renew_session()
+        deadline = time.monotonic() + 5
+        while Trackers.TrackerBase.upload.call_count == uploads:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def read_rows(self, *path):
+        with open(os.path.join(self.save_dir, self.tracker.dev, *path)) as f:
+            return [line.split(',') for line in f.read().splitlines()]
+
+    def read_log(self):
+        """
+        The rows of the log file of the only session.
+        """
+        log_dir = os.path.join(self.date(self.now), 'log')
+        log_files = os.listdir(os.path.join(self.save_dir, self.tracker.dev, log_dir))
+        self.assertEqual(len(log_files), 1)
+        return self.read_rows(log_dir, log_files[0])
+
+    def datetime(self, t):
+        return time.strftime('%Y-%m-%d_%H-%M-%S', time.localtime(t))
+
+    def date(self, t):
+        return time.strftime('%Y%m%d', time.localtime(t))
+
+
+class TestKeyTracker(_TrackerTestCase):
+
+    tracker_class = Trackers.KeyTrackerPrivate
+
+    def setUp(self):
+        super().setUp()
+        self.start_tracker()
+
+    def type_key(self, key):
+        self.tracker._on_press(key)
+        self.tracker._on_release(key)
+
+    def test_log_and_meta(self):
+        start = self.now
+        self.type_key(KeyCode.from_char('a'))
+        self.type_key(KeyCode.from_char('p'))
+        # released without being pressed: not logged
+        self.tracker._on_release(KeyCode.from_char('q'))
+        self.now += 1
+        self.type_key(Key.backspace)
+        self.type_key(Key.shift)
+        self.now += 1
+        self.renew_session()
+        renewed = self.now
+        self.type_key(Key.delete)
+        self.now += 1
+        self.stop()
+
+        date = self.date(start)
+        first_log = self.read_rows(date, 'log', f'key_log_{self.datetime(start)}.csv')
+        self.assertEqual(first_log[0], KEY_HEADER.split(','))
+        self.assertEqual([row[:3] for row in first_log[1:]], [
+            ['left_alphanum', 'NaN', f'{start:.6f}'],
+            ['right_alphanum', 'NaN', f'{start:.6f}'],
+            ['backspace', 'Key.backspace', f'{start + 1:.6f}'],
+            ['special', 'Key.shift', f'{start + 1:.6f}'],
+        ])
+        for row in first_log[1:]:
+            self.assertGreaterEqual(float(row[3]), 0)
+        second_log = self.read_rows(date, 'log', f'key_log_{self.datetime(renewed)}.csv')
+        self.assertEqual([row[:3] for row in second_log],
+                         [KEY_HEADER.split(',')[:3], ['delete', 'Key.delete', f'{renewed:.6f}']])
+
+        meta = self.read_rows(date, 'meta', f'key_meta_{date}.csv')
+        self.assertEqual(meta, [
+            META_HEADER.split(','),
+            [self.datetime(start), self.datetime(renewed), '2.0', self.tracker.git_hash],
+            [self.datetime(renewed), self.datetime(renewed + 1), '1.0', self.tracker.git_hash],
+        ])
+        self.assertEqual(Trackers.TrackerBase.upload.call_args_list, [
+            mock.call(os.path.join(self.save_dir, 'key', date), date),
+            mock.call(os.path.join(self.save_dir, 'key', date), date),
+        ])
+
+    def test_same_second_renewal(self):
+        start = self.now
+        self.type_key(KeyCode.from_char('a'))
+        self.renew_session()
+        self.type_key(KeyCode.from_char('p'))
+        self.stop()
+
+        # both sessions append to the same log file, with a single header
+        date = self.date(start)
+        self.assertEqual(os.listdir(os.path.join(self.save_dir, 'key', date, 'log')),
+                         [f'key_log_{self.datetime(start)}.csv'])
+        log = self.read_rows(date, 'log', f'key_log_{self.datetime(start)}.csv')
+        self.assertEqual([row[:3] for row in log], [
+            KEY_HEADER.split(',')[:3],
+            ['left_alphanum', 'NaN', f'{start:.6f}'],
+            ['right_alphanum', 'NaN', f'{start:.6f}'],
+        ])
+        meta = self.read_rows(date, 'meta', f'key_meta_{date}.csv')
+        self.assertEqual(meta, [META_HEADER.split(',')] + 2 * [
+            [self.datetime(start), self.datetime(start), '0.0', self.tracker.git_hash]])
+
+
+class TestMouseTracker(_TrackerTestCase):
+
+    tracker_class = Trackers.MouseTracker
+
+    def test_log_lines(self):
+        self.start_tracker()
+        start = self.now
+        self.tracker._on_move(1, 2)
+        self.now += 0.25
+        self.tracker._on_click(3, 4, Button.left, True)
+        self.tracker._on_click(3, 4, Button.left, False)
+        self.now += 0.25
+        self.tracker._on_scroll(5, 6, 0, -1)
+        self.stop()
+
+        self.assertEqual(self.read_log(), [row.split(',') for row in [
+            MOUSE_HEADER,
+            f'move,{start:.6f},1,2,NaN,NaN,NaN,NaN',
+            f'click,{start + 0.25:.6f},3,4,Button.left,True,NaN,NaN',
+            f'click,{start + 0.25:.6f},3,4,Button.left,False,NaN,NaN',
+            f'scroll,{start + 0.5:.6f},5,6,NaN,NaN,0,-1',
+        ]])
+
+    def start_filtering_tracker(self, interval=0, distance=0):
+        # the minimums are read from config when the tracker is created
+        with mock.patch.object(config, 'MOUSE_MOVE_MIN_INTERVAL', interval), \
+                mock.patch.object(config, 'MOUSE_MOVE_MIN_DISTANCE', distance):
+            self.start_tracker()
+
+    def logged_moves(self, moves):
+        """
+        Feed (time offset, x, y) moves to the tracker and return the (time offset, x, y) of the
+        logged ones.
+        """
+        start = self.now
+        for offset, x, y in moves:
+            self.now = start + offset
+            self.tracker._on_move(x, y)
+        self.stop()
+        return [(round(float(row[1]) - start, 6), int(row[2]), int(row[3])) for row in self.read_log()[1:]]
+
+    def test_move_min_interval(self):
+        self.start_filtering_tracker(interval=0.5)
+        self.assertEqual(self.logged_moves([
+            (0, 0, 0),  # the first move is always logged
+            (0.2, 1, 0),  # within the interval of the last logged move: dropped
+            (0.5, 2, 0),
+            (0.7, 3, 0),
+            (0.99, 4, 0),
+            # the clock went back: the interval is measured from this move on
+            (0.3, 5, 0),
+            (0.4, 6, 0),
+            (0.8, 7, 0),
+        ]), [(0, 0, 0), (0.5, 2, 0), (0.3, 5, 0), (0.8, 7, 0)])
+
+    def test_move_min_distance(self):
+        self.start_filtering_tracker(distance=3)
+        self.assertEqual(self.logged_moves([
+            (0, 0, 0),  # the first move is always logged
+            (0.1, 1, 1),  # |dx| + |dy| = 2 from the last logged move: dropped
+            (0.2, 2, 1),
+            (0.3, 3, 1),
+            (0.4, 4, 1),
+            (0.5, 5, 1),  # 1 from the last move but 3 from the last logged one
+            (0.6, 5, 3),
+            (0.7, 3, 2),
+        ]), [(0, 0, 0), (0.2, 2, 1), (0.5, 5, 1), (0.7, 3, 2)])
+
+    def test_move_min_interval_and_distance(self):
+        # a move is dropped when either minimum is not reached
+        self.start_filtering_tracker(interval=0.5, distance=3)
+        self.assertEqual(self.logged_moves([
+            (0, 0, 0),
+            (0.1, 10, 0),  # far enough but too soon
+            (1, 1, 0),  # late enough but too close
+            (1.1, 10, 0),
+            (1.7, 12, 0),  # too close
+            (1.8, 10, 5),
+        ]), [(0, 0, 0), (1.1, 10, 0), (1.8, 10, 5)])
+
+    def test_every_move_logged_by_default(self):
+        self.start_filtering_tracker()
+        moves = [(0, 0, 0), (0, 0, 0), (0.001, 1, 0)]
+        self.assertEqual(self.logged_moves(moves), moves)
+
+
+class TestGitRevisionShortHash(unittest.TestCase):
+
+    commit = '0123456789abcdef0123456789abcdef01234567'
+
+    def setUp(self):
+        repo_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(repo_dir.cleanup)
+        self.repo_dir = repo_dir.name
+        self.package_dir = os.path.join(self.repo_dir, 'src', 'key_mouse_tracker')
+        os.makedirs(self.package_dir)
+        os.makedirs(os.path.join(self.repo_dir, '.git', 'refs', 'heads'))
+        Trackers._git_revision_short_hash.cache_clear()
+        self.addCleanup(Trackers._git_revision_short_hash.cache_clear)
+
+    def write(self, path, content):
+        with open(os.path.join(self.repo_dir, path), 'w') as f:
+            f.write(content)
+
+    def test_loose_ref(self):
+        self.write('.git/HEAD', 'ref: refs/heads/main\n')
+        self.write('.git/refs/heads/main', self.commit + '\n')
+        self.assertEqual(Trackers._read_git_head(self.package_dir), self.commit)
+
+    def test_detached_head(self):
+        self.write('.git/HEAD', self.commit + '\n')
+        self.assertEqual(Trackers._read_git_head(self.package_dir), self.commit)
+
+    def test_packed_ref(self):
+        self.write('.git/HEAD', 'ref: refs/heads/main\n')
+        self.write('.git/packed-refs', f'{self.commit} refs/heads/main\n')
+        self.assertIsNone(Trackers._read_git_head(self.package_dir))
+
+    def test_git_file_stops_search(self):
+        # a worktree or submodule inside the repository: its HEAD is not the one of the repository
+        self.write('.git/HEAD', self.commit + '\n')
+        self.write('src/.git', 'gitdir: ../.git/worktrees/src\n')
+        self.assertIsNone(Trackers._read_git_head(self.package_dir))
+
+    def test_short_hash_from_git_dir(self):
+        with mock.patch.object(Trackers, '_read_git_head', return_value=self.commit), \
+                mock.patch('subprocess.check_output') as check_output:
+            self.assertEqual(Trackers._git_revision_short_hash(), self.commit[:7])
+        check_output.assert_not_called()
+
+    def test_short_hash_falls_back_to_git(self):
+        with mock.patch.object(Trackers, '_read_git_head', return_value=None), \
+                mock.patch('subprocess.check_output', return_value=b'0123456\n') as check_output:
+            self.assertEqual(Trackers._git_revision_short_hash(), '0123456')
+            # resolved once per process
+            self.assertEqual(Trackers._git_revision_short_hash(), '0123456')
+        check_output.assert_called_once_with(['git', 'rev-parse', '--short', 'HEAD'], cwd=mock.ANY)
+
+
+if __name__ == '__main__':
+    unittest.main()